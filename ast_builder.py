@@ -1,4 +1,5 @@
-from lark import Transformer
+from functools import reduce
+from lark import Transformer, Token
 from ast_nodes import (
     Strategy,
     LogicalExpression,
@@ -11,6 +12,23 @@ from ast_nodes import (
 )
 
 
+def _logical_handler(operator):
+    def handler(self, items):
+        operands = [item for item in items if not isinstance(item, Token)]
+        return reduce(
+            lambda left, right: LogicalExpression(left=left, operator=operator, right=right),
+            operands[1:],
+            operands[0],
+        )
+    return handler
+
+
+def _binary_handler(operator):
+    def handler(self, items):
+        return BinaryExpression(left=items[0], operator=operator, right=items[1])
+    return handler
+
+
 class ASTBuilder(Transformer):
     def start(self, items):
         return items[0]
@@ -39,26 +57,13 @@ class ASTBuilder(Transformer):
     def expr(self, items):
         return items[0]
 
-    def or_expr(self, items):
-        node = items[0]
-        i = 1
-        while i < len(items):
-            node = LogicalExpression(left=node, operator="OR", right=items[i])
-            i += 1
-        return node
-
-    def and_expr(self, items):
-        node = items[0]
-        i = 1
-        while i < len(items):
-            node = LogicalExpression(left=node, operator="AND", right=items[i])
-            i += 1
-        return node
+    or_expr = _logical_handler("OR")
+    and_expr = _logical_handler("AND")
 
     def comparison(self, items):
         if len(items) == 1:
             return items[0]
-        return ComparisonExpression(left=items[0], operator=str(items[1]), right=items[2])
+        return ComparisonExpression(left=items[0], operator=items[1].value, right=items[2])
 
     def cross_expr(self, items):
         return items[0]
@@ -86,17 +91,10 @@ class ASTBuilder(Transformer):
 
 
 
-    def add(self, items):
-        return BinaryExpression(left=items[0], operator="+", right=items[1])
-
-    def sub(self, items):
-        return BinaryExpression(left=items[0], operator="-", right=items[1])
-
-    def mul(self, items):
-        return BinaryExpression(left=items[0], operator="*", right=items[1])
-
-    def div(self, items):
-        return BinaryExpression(left=items[0], operator="/", right=items[1])
+    add = _binary_handler("+")
+    sub = _binary_handler("-")
+    mul = _binary_handler("*")
+    div = _binary_handler("/")
 
     def factor(self, items):
         return items[0]
@@ -110,7 +108,7 @@ class ASTBuilder(Transformer):
         return items
 
     def IDENTIFIER(self, token):
-        return Identifier(name=str(token))
+        return Identifier(name=token.value)
 
     def NUMBER(self, token):
         return Number(value=float(token))
@@ -0,0 +1,129 @@
+import pandas as pd
+import polars as pl
+from ast_nodes import (
+    Strategy,
+    LogicalExpression,
+    ComparisonExpression,
+    CrossExpression,
+    BinaryExpression,
+    FunctionCall,
+    Identifier,
+    Number,
+)
+from ast_to_python import fold, lookback
+
+
+class ASTToPolars:
+    def __init__(self, df: pd.DataFrame):
+        self.df = df
+
+    def eval(self, node):
+        if not isinstance(node, Strategy):
+            raise ValueError(f"Expected a Strategy, got {type(node)}")
+
+        columns = {}
+        if node.entry:
+            columns["entry"] = self.to_expr(fold(node.entry))
+        if node.exit:
+            columns["exit"] = self.to_expr(fold(node.exit))
+        if not columns:
+            return None, None
+
+        # NaN compares greater than every number in polars, so every
+        # comparison operand is normalised to null and nulls count as False.
+        signals = (
+            pl.from_pandas(self.df)
+            .lazy()
+            .with_columns(expr.fill_null(False).alias(f"__{name}__") for name, expr in columns.items())
+            .select(f"__{name}__" for name in columns)
+            .collect()
+        )
+
+        entry = self._to_series(signals, "entry") if "entry" in columns else None
+        exit = self._to_series(signals, "exit") if "exit" in columns else None
+        return entry, exit
+
+    def _to_series(self, signals, name):
+        return pd.Series(signals[f"__{name}__"].to_numpy(), index=self.df.index)
+
+    def to_expr(self, node):
+        if isinstance(node, Number):
+            return pl.lit(node.value)
+
+        if isinstance(node, Identifier):
+            column, periods = lookback(node.name)
+            if periods:
+                return pl.col(column).shift(periods)
+            return pl.col(column)
+
+        if isinstance(node, FunctionCall):
+            return self._function(node)
+
+        if isinstance(node, BinaryExpression):
+            left = self.to_expr(node.left)
+            right = self.to_expr(node.right)
+            if node.operator == "+":
+                return left + right
+            if node.operator == "-":
+                return left - right
+            if node.operator == "*":
+                return left * right
+            if node.operator == "/":
+                return left / right
+            raise ValueError(f"Unknown operator: {node.operator}")
+
+        if isinstance(node, ComparisonExpression):
+            left = self.to_expr(node.left).fill_nan(None)
+            right = self.to_expr(node.right).fill_nan(None)
+            if node.operator == ">":
+                return left > right
+            if node.operator == "<":
+                return left < right
+            if node.operator == ">=":
+                return left >= right
+            if node.operator == "<=":
+                return left <= right
+            if node.operator == "==":
+                return left == right
+            raise ValueError(f"Unknown operator: {node.operator}")
+
+        if isinstance(node, CrossExpression):
+            diff = (self.to_expr(node.left) - self.to_expr(node.right)).fill_nan(None)
+            if node.operator == "CROSS_ABOVE":
+                return (diff > 0) & (diff.shift(1) <= 0)
+            if node.operator == "CROSS_BELOW":
+                return (diff < 0) & (diff.shift(1) >= 0)
+            raise ValueError(f"Unknown operator: {node.operator}")
+
+        if isinstance(node, LogicalExpression):
+            left = self.to_expr(node.left)
+            right = self.to_expr(node.right)
+            if node.operator == "AND":
+                return left & right
+            return left | right
+
+        raise ValueError(f"Unknown AST node: {type(node)}")
+
+    def _function(self, node):
+        name = node.name.lower()
+        args = node.arguments
+
+        if name == "sma":
+            series = self.to_expr(args[0])
+            window = self._window(args[1])
+            return series.rolling_mean(window)
+
+        if name == "rsi":
+            series = self.to_expr(args[0])
+            window = self._window(args[1])
+            delta = series.diff()
+            gain = delta.clip(lower_bound=0).rolling_mean(window)
+            loss = (-delta).clip(lower_bound=0).rolling_mean(window)
+            return 100 - (100 / (1 + gain / loss))
+
+        raise ValueError(f"Unknown function: {node.name}")
+
+    def _window(self, node):
+        if not isinstance(node, Number):
+            raise ValueError(f"Window must be a constant number, got {type(node)}")
+        return int(node.value)
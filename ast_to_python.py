@@ -1,7 +1,13 @@
+import operator
+import numpy as np
 import pandas as pd
+from numba import njit
+from dataclasses import fields, is_dataclass, replace
+from functools import lru_cache
 from lark.lexer import Token
 from ast_nodes import (
     Strategy,
+    Expression,
     LogicalExpression,
     ComparisonExpression,
     CrossExpression,
@@ -10,105 +16,391 @@ from ast_nodes import (
     Identifier,
     Number,
 )
+from indicators import sma, rsi, sma_values, rsi_values
+
+try:
+    import numexpr
+except ImportError:
+    numexpr = None
+
+
+_FUNCTIONS = frozenset(("sma", "rsi"))
+
+_NUMEXPR_OPERATORS = {"AND": "&", "OR": "|"}
+
+_CROSS_HELPERS = {"CROSS_ABOVE": "cross_above", "CROSS_BELOW": "cross_below"}
+
+_LOGICAL_HELPERS = {"AND": "logical_and", "OR": "logical_or"}
+
+_LOOKBACKS = {"_yesterday": 1, "_last_week": 5}
+
+_ARITHMETIC = {
+    "+": operator.add,
+    "-": operator.sub,
+    "*": operator.mul,
+    "/": operator.truediv,
+}
+
+
+def lookback(name):
+    for suffix, periods in _LOOKBACKS.items():
+        if name.endswith(suffix):
+            return name[:-len(suffix)], periods
+    return name, 0
+
+
+def shift(values, periods):
+    out = np.full(len(values), np.nan)
+    if periods < len(values):
+        out[periods:] = values[:len(values) - periods]
+    return out
+
+
+def cross_above(left, right):
+    return _cross_core(_difference(left, right), True)
+
+
+def cross_below(left, right):
+    return _cross_core(_difference(left, right), False)
+
+
+@njit(cache=True)
+def _cross_core(diff, above):
+    # One pass over the spread; NaN comparisons are False, so bars next to
+    # missing values never report a cross.
+    out = np.zeros(diff.size, dtype=np.bool_)
+    for i in range(1, diff.size):
+        if above:
+            out[i] = diff[i] > 0.0 and diff[i - 1] <= 0.0
+        else:
+            out[i] = diff[i] < 0.0 and diff[i - 1] >= 0.0
+    return out
+
+
+def _difference(left, right):
+    return np.asarray(left, dtype=np.float64) - np.asarray(right, dtype=np.float64)
+
+
+def _cross_diff(left, right):
+    diff = _difference(left, right)
+    prev_diff = np.empty_like(diff)
+    prev_diff[:1] = np.nan
+    prev_diff[1:] = diff[:-1]
+    return diff, prev_diff
+
+
+def fold(node):
+    if isinstance(node, BinaryExpression):
+        left = fold(node.left)
+        right = fold(node.right)
+        if isinstance(left, Number) and isinstance(right, Number):
+            return Number(value=_ARITHMETIC[node.operator](left.value, right.value))
+        return replace(node, left=left, right=right)
+
+    if isinstance(node, (ComparisonExpression, CrossExpression, LogicalExpression)):
+        return replace(node, left=fold(node.left), right=fold(node.right))
+
+    if isinstance(node, FunctionCall):
+        return replace(node, arguments=[fold(arg) for arg in node.arguments])
+
+    return node
+
+
+def logical_and(*operands):
+    return np.logical_and.reduce([np.asarray(operand, dtype=bool) for operand in operands])
+
+
+def logical_or(*operands):
+    return np.logical_or.reduce([np.asarray(operand, dtype=bool) for operand in operands])
+
+
+_HELPERS = {
+    "np": np,
+    "sma": sma_values,
+    "rsi": rsi_values,
+    "shift": shift,
+    "cross_above": cross_above,
+    "cross_below": cross_below,
+    "logical_and": logical_and,
+    "logical_or": logical_or,
+}
+
+
+@lru_cache(maxsize=256)
+def _build_signal(source):
+    namespace = dict(_HELPERS)
+    exec(compile(source, "<ast>", "exec"), namespace)
+    return namespace["_signal"]
+
 
 class ASTToPython:
     def __init__(self, df: pd.DataFrame):
         self.df = df
+        self._cache: dict[tuple, pd.Series] = {}
+        self._dispatch = {
+            Number: self._number,
+            Identifier: self._identifier,
+            FunctionCall: self._function,
+            BinaryExpression: self._binary,
+        }
 
     def _to_series(self, value):
         if isinstance(value, pd.Series):
             return value
-        return pd.Series([value] * len(self.df), index=self.df.index)
+        return pd.Series(value, index=self.df.index)
+
+    def _key(self, node):
+        if is_dataclass(node):
+            return (type(node).__name__,) + tuple(
+                self._key(getattr(node, f.name)) for f in fields(node)
+            )
+        if isinstance(node, list):
+            return tuple(self._key(item) for item in node)
+        return node
 
     def eval(self, node):
+        if isinstance(node, Strategy):
+            return self._strategy(node)
+
+        if isinstance(node, (ComparisonExpression, CrossExpression, LogicalExpression)):
+            return self._fused(fold(node))
+
+        # Value nodes (numbers, columns, indicators and arithmetic on them)
+        # are walked post-order on an explicit stack: a node is pushed once
+        # to expand its children and once more (with its key) to combine the
+        # child values left on the value stack.
+        stack = [(node, None)]
+        values = []
+        while stack:
+            current, key = stack.pop()
+
+            if key is None:
+                if not isinstance(current, Expression):
+                    values.append(self._leaf(current))
+                    continue
+                if type(current) not in self._dispatch:
+                    raise ValueError(f"Unknown AST node: {type(current)}")
+                key = self._key(current)
+                if key in self._cache:
+                    values.append(self._cache[key])
+                    continue
+                stack.append((current, key))
+                stack.extend((child, None) for child in reversed(self._children(current)))
+                continue
+
+            arity = len(self._children(current))
+            args = values[len(values) - arity:]
+            del values[len(values) - arity:]
+            result = self._dispatch[type(current)](current, *args)
+            if isinstance(result, pd.Series):
+                self._cache[key] = result
+            values.append(result)
+
+        return values[0]
+
+    def _leaf(self, node):
         if isinstance(node, pd.Series):
             return node
 
         if isinstance(node, Token):
             return node.value
 
+        raise ValueError(f"Unknown AST node: {type(node)}")
+
+    def _children(self, node):
+        if isinstance(node, FunctionCall):
+            return node.arguments
+        if isinstance(node, BinaryExpression):
+            return [node.left, node.right]
+        return []
+
+    def _number(self, node):
+        return node.value
+
+    def _binary(self, node, left, right):
+        if node.operator == "+":
+            return left + right
+        if node.operator == "-":
+            return left - right
+        if node.operator == "*":
+            return left * right
+        if node.operator == "/":
+            return left / right
+        raise ValueError(f"Unknown operator: {node.operator}")
+
+    def _flatten(self, node):
+        operands = []
+        for child in (node.left, node.right):
+            if isinstance(child, LogicalExpression) and child.operator == node.operator:
+                operands.extend(self._flatten(child))
+            else:
+                operands.append(child)
+        return operands
+
+    def _strategy(self, node):
+        entry = self._fused(fold(node.entry)) if node.entry else None
+        exit = self._fused(fold(node.exit)) if node.exit else None
+        return entry, exit
+
+    def to_expr(self, node):
+        local_dict = {}
+        bound = {}
+        expr = self._to_expr(node, local_dict, bound)
+        return expr, local_dict
+
+    def _to_expr(self, node, local_dict, bound):
         if isinstance(node, Number):
-            return node.value
+            return repr(node.value)
+
+        if isinstance(node, (Identifier, FunctionCall)):
+            key = self._key(node)
+            if key not in bound:
+                bound[key] = f"v{len(bound)}"
+                local_dict[bound[key]] = self.eval(node).to_numpy()
+            return bound[key]
+
+        if isinstance(node, CrossExpression):
+            key = self._key(node)
+            if key not in bound:
+                left = self._to_series(self.eval(node.left))
+                right = self.eval(node.right)
+                bound[key] = (f"v{len(bound)}", f"v{len(bound)}_prev")
+                local_dict[bound[key][0]], local_dict[bound[key][1]] = _cross_diff(left, right)
+            diff, prev_diff = bound[key]
+            if node.operator == "CROSS_ABOVE":
+                return f"({diff} > 0) & ({prev_diff} <= 0)"
+            if node.operator == "CROSS_BELOW":
+                return f"({diff} < 0) & ({prev_diff} >= 0)"
+            return None
+
+        if isinstance(node, ComparisonExpression) and self._is_scalar(node.left) and self._is_scalar(node.right):
+            # numexpr folds a constant comparison to a Python bool, which
+            # cannot be combined with array operands; let compile handle it.
+            return None
+
+        if isinstance(node, (BinaryExpression, ComparisonExpression, LogicalExpression)):
+            left = self._to_expr(node.left, local_dict, bound)
+            right = self._to_expr(node.right, local_dict, bound)
+            if left is None or right is None:
+                return None
+            op = _NUMEXPR_OPERATORS.get(node.operator, node.operator)
+            return f"({left}) {op} ({right})"
+
+        return None
+
+    def compile_signal(self, node):
+        lines = []
+        result = self._source(node, lines, {})
+        source = "\n".join(
+            [f"def _signal(df, {', '.join(f'{name}={name}' for name in _HELPERS)}):"]
+            + [f"    {line}" for line in lines]
+            + [f"    return {result}"]
+        )
+        return _build_signal(source)
+
+    def _source(self, node, lines, bound):
+        if isinstance(node, Number):
+            return repr(node.value)
 
         if isinstance(node, Identifier):
-            return self._identifier(node.name)
+            column, periods = lookback(node.name)
+            source = self._bind_column(column, lines, bound)
+            if periods:
+                return self._bind(node, f"shift({source}, {periods})", lines, bound)
+            return source
 
         if isinstance(node, FunctionCall):
-            return self._function(node)
+            name = node.name.lower()
+            if name not in _FUNCTIONS:
+                raise ValueError(f"Unknown function: {node.name}")
+            series = self._source(node.arguments[0], lines, bound)
+            window = self._source(node.arguments[1], lines, bound)
+            return self._bind(node, f"{name}({series}, int({window}))", lines, bound)
 
         if isinstance(node, BinaryExpression):
-            left = self.eval(node.left)
-            right = self.eval(node.right)
-            if node.operator == "+":
-                return left + right
-            if node.operator == "-":
-                return left - right
-            if node.operator == "*":
-                return left * right
-            if node.operator == "/":
-                return left / right
+            left = self._source(node.left, lines, bound)
+            right = self._source(node.right, lines, bound)
+            return f"({left} {node.operator} {right})"
 
         if isinstance(node, ComparisonExpression):
-            left = self.eval(node.left)
-            right = self.eval(node.right)
-            if node.operator == ">":
-                return self._to_series(left > right)
-            if node.operator == "<":
-                return self._to_series(left < right)
-            if node.operator == ">=":
-                return self._to_series(left >= right)
-            if node.operator == "<=":
-                return self._to_series(left <= right)
-            if node.operator == "==":
-                return self._to_series(left == right)
-
+            left = self._source(node.left, lines, bound)
+            right = self._source(node.right, lines, bound)
+            if self._is_scalar(node.left) and self._is_scalar(node.right):
+                return f"np.full(len(df), {left} {node.operator} {right})"
+            return f"({left} {node.operator} {right})"
 
         if isinstance(node, CrossExpression):
-            left = self.eval(node.left)
-            right = self.eval(node.right)
-            if node.operator == "CROSS_ABOVE":
-                return (left > right) & (left.shift(1) <= right.shift(1))
-            if node.operator == "CROSS_BELOW":
-                return (left < right) & (left.shift(1) >= right.shift(1))
+            func = _CROSS_HELPERS[node.operator]
+            left = self._source(node.left, lines, bound)
+            right = self._source(node.right, lines, bound)
+            if self._is_scalar(node.left):
+                left = f"np.full(len(df), {left})"
+            return f"{func}({left}, {right})"
 
         if isinstance(node, LogicalExpression):
-            left = self._to_series(self.eval(node.left))
-            right = self._to_series(self.eval(node.right))
-            if node.operator == "AND":
-                return left & right
-            return left | right
-
-        if isinstance(node, Strategy):
-            entry = self.eval(node.entry) if node.entry else None
-            exit = self.eval(node.exit) if node.exit else None
-            return entry, exit
+            func = _LOGICAL_HELPERS[node.operator]
+            operands = ", ".join(self._source(operand, lines, bound) for operand in self._flatten(node))
+            return f"{func}({operands})"
 
         raise ValueError(f"Unknown AST node: {type(node)}")
 
+    def _bind_column(self, name, lines, bound):
+        key = ("column", name)
+        if key not in bound:
+            bound[key] = f"col_{name}"
+            lines.append(f"{bound[key]} = df[{name!r}].to_numpy()")
+        return bound[key]
+
+    def _bind(self, node, source, lines, bound):
+        key = self._key(node)
+        if key not in bound:
+            bound[key] = f"t{sum(name.startswith('t') for name in bound.values())}"
+            lines.append(f"{bound[key]} = {source}")
+        return bound[key]
+
+    def _is_scalar(self, node):
+        if isinstance(node, Number):
+            return True
+        if isinstance(node, BinaryExpression):
+            return self._is_scalar(node.left) and self._is_scalar(node.right)
+        return False
+
+    def _run(self, node):
+        return pd.Series(self.compile_signal(node)(self.df), index=self.df.index)
+
+    def _fused(self, node):
+        if numexpr is None:
+            return self._run(node)
+
+        expr, local_dict = self.to_expr(node)
+        if expr is None or not local_dict:
+            return self._run(node)
+        try:
+            values = numexpr.evaluate(expr, local_dict=local_dict)
+        except ValueError:
+            # numexpr caps the number of array inputs (NPY_MAXARGS: 32 on
+            # numpy 1.x, 64 on 2.x) and each cross binds two of them.
+            return self._run(node)
+        return pd.Series(values, index=self.df.index)
 
-    def _identifier(self, name):
-        if name.endswith("_yesterday"):
-            return self.df[name.replace("_yesterday", "")].shift(1)
-        if name.endswith("_last_week"):
-            return self.df[name.replace("_last_week", "")].shift(5)
-        return self.df[name]
+    def _identifier(self, node):
+        column, periods = lookback(node.name)
+        if periods:
+            return self.df[column].shift(periods)
+        return self.df[column]
 
-    def _function(self, node):
+    def _function(self, node, series, window):
         name = node.name.lower()
-        args = node.arguments
 
         if name == "sma":
-            series = self.eval(args[0])
-            window = int(self.eval(args[1]))
-            return series.rolling(window).mean()
+            return sma(series, int(window))
 
         if name == "rsi":
-            series = self.eval(args[0])
-            window = int(self.eval(args[1]))
-            delta = series.diff()
-            gain = delta.clip(lower=0).rolling(window).mean()
-            loss = -delta.clip(upper=0).rolling(window).mean()
-            rs = gain / loss
-            return 100 - (100 / (1 + rs))
+            return rsi(series, int(window))
 
         raise ValueError(f"Unknown function: {node.name}")
+
+
+# Load the cross kernel at import so the first strategy does not pay for
+# it; its input is always a freshly computed, writeable float64 spread.
+_cross_core(np.zeros(1), True)
@@ -1,8 +1,7 @@
 import pandas as pd
 
 from nl_to_dsl import nl_to_json, json_to_dsl
-from parser import parse_dsl
-from ast_builder import ASTBuilder
+from strategy_cache import compile_dsl
 from ast_to_python import ASTToPython
 from simulator import run_backtest
 
@@ -21,8 +20,7 @@ def main():
     print("\nGenerated DSL:\n")
     print(dsl)
 
-    parse_tree = parse_dsl(dsl)
-    ast = ASTBuilder().transform(parse_tree)
+    ast = compile_dsl(dsl)
 
     engine = ASTToPython(df)
     entry_signal, exit_signal = engine.eval(ast)
@@ -0,0 +1,33 @@
+from decimal import Decimal
+
+
+def json_to_dsl(nl_input) -> str:
+    sections = []
+    if nl_input.get("entry"):
+        sections.append("ENTRY:\n" + _render_rules(nl_input["entry"]))
+    if nl_input.get("exit"):
+        sections.append("EXIT:\n" + _render_rules(nl_input["exit"]))
+    return "\n".join(sections)
+
+
+def _render_rules(rules) -> str:
+    parts = []
+    for i, rule in enumerate(rules):
+        operator = rule["operator"]
+        left = _render_value(rule["left"])
+        right = _render_value(rule["right"])
+        if operator in ("CROSS_ABOVE", "CROSS_BELOW"):
+            parts.append(f"{operator}({left}, {right})")
+        else:
+            parts.append(f"{left} {operator} {right}")
+        if i < len(rules) - 1:
+            parts.append((rule.get("logic") or "AND").upper())
+    return " ".join(parts)
+
+
+def _render_value(value) -> str:
+    # The grammar's NUMBER terminal has no exponent form, so numbers are
+    # written out positionally (1e16 -> 10000000000000000).
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return format(Decimal(repr(value)), "f")
+    return str(value)
@@ -0,0 +1,127 @@
+import numpy as np
+import pandas as pd
+from numba import njit
+
+from jit_utils import warm_up
+
+
+@njit(cache=True)
+def _sma_core(x, window):
+    n = x.size
+    out = np.full(n, np.nan)
+    total = 0.0
+    compensation = 0.0
+    valid = 0
+
+    for i in range(n):
+        # Kahan-compensated running sum: add the value entering the window
+        # and subtract the one leaving it, so long series do not drift.
+        # Like pandas' rolling(), inf counts as missing, so it never poisons
+        # the running total.
+        v = x[i]
+        if np.isfinite(v):
+            valid += 1
+            y = v - compensation
+            t = total + y
+            compensation = (t - total) - y
+            total = t
+
+        j = i - window
+        if j >= 0:
+            v = x[j]
+            if np.isfinite(v):
+                valid -= 1
+                y = -v - compensation
+                t = total + y
+                compensation = (t - total) - y
+                total = t
+
+        if valid == window:
+            out[i] = total / window
+
+    return out
+
+
+def _check_window(window):
+    # Same contract as pandas' rolling(): negative windows are rejected and
+    # a zero window yields no values.
+    if window < 0:
+        raise ValueError(f"Invalid window: {window}")
+
+
+def sma_values(values: np.ndarray, window: int) -> np.ndarray:
+    _check_window(window)
+    if window == 0:
+        return np.full(len(values), np.nan)
+    return _sma_core(np.asarray(values, dtype=np.float64), window)
+
+
+def sma(series: pd.Series, window: int) -> pd.Series:
+    return pd.Series(sma_values(series.to_numpy(), window), index=series.index)
+
+
+@njit(cache=True)
+def _rsi_core(x, window):
+    n = x.size
+    out = np.full(n, np.nan)
+    gain_sum = 0.0
+    loss_sum = 0.0
+    gain_ct = 0
+    loss_ct = 0
+    valid = 0
+
+    for i in range(1, n):
+        # Infinite deltas count as missing, as in pandas' rolling().
+        d = x[i] - x[i - 1]
+        if np.isfinite(d):
+            valid += 1
+            if d > 0:
+                gain_sum += d
+                gain_ct += 1
+            elif d < 0:
+                loss_sum -= d
+                loss_ct += 1
+
+        j = i - window
+        if j >= 1:
+            d = x[j] - x[j - 1]
+            if np.isfinite(d):
+                valid -= 1
+                if d > 0:
+                    gain_sum -= d
+                    gain_ct -= 1
+                elif d < 0:
+                    loss_sum += d
+                    loss_ct -= 1
+
+        # Reset sums that have emptied out so drift never shows up as a
+        # tiny non-zero average gain or loss.
+        if gain_ct == 0:
+            gain_sum = 0.0
+        if loss_ct == 0:
+            loss_sum = 0.0
+
+        if valid == window:
+            if loss_sum == 0.0:
+                if gain_sum > 0.0:
+                    out[i] = 100.0
+            else:
+                out[i] = 100.0 - 100.0 / (1.0 + gain_sum / loss_sum)
+
+    return out
+
+
+def rsi_values(values: np.ndarray, window: int) -> np.ndarray:
+    _check_window(window)
+    if window == 0:
+        return np.full(len(values), np.nan)
+    return _rsi_core(np.asarray(values, dtype=np.float64), window)
+
+
+def rsi(series: pd.Series, window: int) -> pd.Series:
+    return pd.Series(rsi_values(series.to_numpy(), window), index=series.index)
+
+
+# Pay the JIT cost at import rather than on the first evaluation.
+warm_up(lambda values: _sma_core(values, 1))
+warm_up(lambda values: _rsi_core(values, 1))
@@ -0,0 +1,11 @@
+import numpy as np
+
+
+def warm_up(call, dtype=np.float64):
+    # Compile (or load from the on-disk cache) at import with both array
+    # layouts real calls use: Series.to_numpy() can hand back read-only
+    # views, which numba types separately from writeable arrays.
+    for writeable in (True, False):
+        array = np.zeros(1, dtype=dtype)
+        array.flags.writeable = writeable
+        call(array)
@@ -1,7 +1,14 @@
+from copy import deepcopy
+from functools import lru_cache
 from llm_client import groq_client
+from dsl_renderer import json_to_dsl
 import json
 
 def nl_to_json(user_input: str):
+    return deepcopy(_nl_to_json(user_input))
+
+@lru_cache(maxsize=1024)
+def _nl_to_json(user_input: str):
     prompt = """
         You are a compiler front-end.
 
@@ -93,84 +100,3 @@ def nl_to_json(user_input: str):
         response = response[4:].strip()
 
     return json.loads(response)
-
-def json_to_dsl(nl_input) -> str:
-    prompt = f"""
-        You are a deterministic DSL code generator.
-
-        Your task is to convert the given JSON into a valid DSL.
-        The DSL is a formal language. You MUST preserve semantics exactly.
-
-        Rules (MANDATORY):
-        - Output ONLY DSL text. No explanations, no markdown.
-        - Use "ENTRY:" for entry conditions (Optional: Omit if no entry rules).
-        - Use "EXIT:" for exit conditions (Optional: Omit if no exit rules).
-        - Do NOT invent, drop, or modify rules.
-        - Do NOT invent, drop, or modify rules.
-        - Preserve operators exactly as provided in JSON.
-        - Combine rules using the "logic" field (AND/OR). If missing, use AND.
-        - Keep indicator syntax unchanged (e.g. sma(close,20), rsi(close,14)).
-
-        Operator rendering rules (CRITICAL):
-        - If operator is ">", "<", ">=", "<=", "==":
-        render as: left operator right
-        Example: close > sma(close,20)
-
-        - If operator is "CROSS_ABOVE":
-        render as: CROSS_ABOVE(left, right)
-
-        - If operator is "CROSS_BELOW":
-        render as: CROSS_BELOW(left, right)
-
-        - CROSS operators must ALWAYS be rendered as function calls:
-        CROSS_ABOVE(left, right)
-        CROSS_BELOW(left, right)
-
-        - Never render CROSS operators in infix form.
-
-        - NEVER convert CROSS_ABOVE or CROSS_BELOW into > or <.
-
-        Formatting rules:
-        - ENTRY: and EXIT: must be uppercase.
-        - Each section must be on its own line.
-        - Conditions must be written on a single line per section.
-
-        Example JSON:
-        {{
-        "entry": [
-            {{ "left": "close", "operator": ">", "right": "sma(close,20)" }},
-            {{ "left": "volume", "operator": ">", "right": 1000000 }}
-        ],
-        "exit": [
-            {{ "left": "rsi(close,14)", "operator": "<", "right": 30 }}
-        ]
-        }}
-
-        Example DSL:
-        ENTRY:
-        close > sma(close,20) AND volume > 1000000
-        EXIT:
-        rsi(close,14) < 30
-
-        JSON to convert:
-        {json.dumps(nl_input, indent=2)}
-    """
-
-    dsl = groq_client.invoke(prompt).strip()
-    if dsl.startswith("```"):
-        dsl = dsl.strip("`").strip()
-        first_line = dsl.split("\n", 1)[0].strip().lower()
-        if first_line in ["dsl", "text", "plaintext"]:
-             lines = dsl.splitlines()[1:]
-             dsl = "\n".join(lines).strip()
-    
-    if dsl.strip().endswith("EXIT:"):
-        dsl = dsl.rsplit("EXIT:", 1)[0].strip()
-        
-    dsl = dsl.replace("ENTRY:\nEXIT:", "EXIT:").replace("ENTRY: \nEXIT:", "EXIT:")
-    if dsl.strip() == "ENTRY:":
-        dsl = ""
-
-    return dsl
-
-
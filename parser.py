@@ -1,9 +1,9 @@
+from pathlib import Path
 from lark import Lark
 
-with open("dsl_grammar.lark") as f:
-    grammar = f.read()
+_GRAMMAR_PATH = Path(__file__).parent / "dsl_grammar.lark"
 
-_parser = Lark(grammar, parser="earley")
+_parser = Lark(_GRAMMAR_PATH.read_text(), parser="lalr", cache=True)
 
 def parse_dsl(dsl_text: str):
     return _parser.parse(dsl_text)
@@ -1,50 +1,79 @@
+import numpy as np
+from numba import njit
+
+from jit_utils import warm_up
+
+
+@njit(cache=True)
+def _pair_trades(entries, exits):
+    # Every trade spans at least two bars, so n // 2 bounds the trade count.
+    n = entries.size
+    entry_idx = np.empty(n // 2, dtype=np.int64)
+    exit_idx = np.empty(n // 2, dtype=np.int64)
+    count = 0
+    entry = -1
+
+    for i in range(n):
+        if entry < 0:
+            if entries[i]:
+                entry = i
+        elif exits[i] or i == n - 1:
+            entry_idx[count] = entry
+            exit_idx[count] = i
+            count += 1
+            entry = -1
+
+    return entry_idx[:count], exit_idx[:count]
+
+
 def run_backtest(df, entry_signal, exit_signal):
-    in_position = False
-    entry_price = None
-    entry_date = None
-    trades = []
-    
-    equity = 1.0
-    peak_equity = 1.0
-    max_drawdown = 0.0
-
-    for i in range(len(df)):
-        if not in_position and entry_signal is not None and entry_signal.iloc[i]:
-            in_position = True
-            entry_price = df["close"].iloc[i]
-            entry_date = df.index[i]
-
-        elif in_position:
-            should_exit = (exit_signal is not None and exit_signal.iloc[i]) or (i == len(df) - 1)
-            
-            if should_exit:
-                exit_price = df["close"].iloc[i]
-                exit_date = df.index[i]
-                
-                pct_change = (exit_price - entry_price) / entry_price
-                equity *= (1 + pct_change)
-                peak_equity = max(peak_equity, equity)
-                drawdown = (equity - peak_equity) / peak_equity
-                max_drawdown = min(max_drawdown, drawdown)
-
-                trades.append({
-                    "entry_date": entry_date,
-                    "exit_date": exit_date,
-                    "entry_price": entry_price,
-                    "exit_price": exit_price,
-                    "pnl": exit_price - entry_price,
-                    "return_pct": pct_change * 100
-                })
-
-                in_position = False
-                entry_price = None
-                entry_date = None
-
-    total_return = (equity - 1.0) * 100
+    close = df["close"].to_numpy()
+    dates = df.index
+    n = len(close)
+    entries = np.zeros(n, dtype=bool) if entry_signal is None else entry_signal.to_numpy(dtype=bool)
+    exits = np.zeros(n, dtype=bool) if exit_signal is None else exit_signal.to_numpy(dtype=bool)
+
+    entry_idx, exit_idx = _pair_trades(entries, exits)
+    entry_prices = close[entry_idx]
+    exit_prices = close[exit_idx]
+    pnl = exit_prices - entry_prices
+    return_pct = pnl / entry_prices * 100
+
+    trades = [
+        {
+            "entry_date": entry_date,
+            "exit_date": exit_date,
+            "entry_price": entry_price,
+            "exit_price": exit_price,
+            "pnl": trade_pnl,
+            "return_pct": trade_return
+        }
+        for entry_date, exit_date, entry_price, exit_price, trade_pnl, trade_return in zip(
+            dates[entry_idx], dates[exit_idx],
+            entry_prices.tolist(), exit_prices.tolist(), pnl.tolist(), return_pct.tolist()
+        )
+    ]
+
+    equity = np.cumprod(np.concatenate(([1.0], 1 + pnl / entry_prices)))
+    peak_equity = np.maximum.accumulate(equity)
+    max_drawdown = ((equity - peak_equity) / peak_equity).min()
+    total_return = (equity[-1] - 1.0) * 100
 
     return {
         "num_trades": len(trades),
         "total_return": total_return,
         "max_drawdown": max_drawdown * 100,
-        "trades": trades
+        "trades": trades,
+        "trade_arrays": {
+            "entry_idx": entry_idx,
+            "exit_idx": exit_idx,
+            "entry_price": entry_prices,
+            "exit_price": exit_prices,
+            "pnl": pnl,
+            "return_pct": return_pct
+        }
     }
+
+
+# Pay the JIT cost at import rather than on the first backtest.
+warm_up(lambda signals: _pair_trades(signals, signals), dtype=np.bool_)
@@ -0,0 +1,9 @@
+from functools import lru_cache
+
+from parser import parse_dsl
+from ast_builder import ASTBuilder
+
+
+@lru_cache(maxsize=256)
+def compile_dsl(dsl: str):
+    return ASTBuilder().transform(parse_dsl(dsl))
@@ -0,0 +1,48 @@
+import unittest
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+import ast_to_python
+from ast_to_python import ASTToPython
+from strategy_cache import compile_dsl
+
+
+@unittest.skipIf(ast_to_python.numexpr is None, "numexpr is not installed")
+class TestNumexprFallback(unittest.TestCase):
+    def setUp(self):
+        close = 100 + np.cumsum(np.random.default_rng(0).standard_normal(60))
+        self.df = pd.DataFrame({"close": close}, index=pd.date_range("2024-01-01", periods=60))
+
+    def test_constant_on_left_matches_compiled_fallback(self):
+        for dsl in (
+            "ENTRY: 1 > 2 AND close > 100",
+            "ENTRY: (1 > 2) OR close > 100",
+            "ENTRY: 1 < 2 AND CROSS_ABOVE(close, sma(close,5))",
+        ):
+            with self.subTest(dsl=dsl):
+                entry, _ = ASTToPython(self.df).eval(compile_dsl(dsl))
+                with mock.patch.object(ast_to_python, "numexpr", None):
+                    expected, _ = ASTToPython(self.df).eval(compile_dsl(dsl))
+                pd.testing.assert_series_equal(entry, expected)
+
+    def test_too_many_inputs_falls_back(self):
+        # Each cross binds two arrays, which overflows numexpr's input limit.
+        dsl = "ENTRY: " + " OR ".join(f"CROSS_ABOVE(close, sma(close,{i}))" for i in range(2, 41))
+        entry, _ = ASTToPython(self.df).eval(compile_dsl(dsl))
+        with mock.patch.object(ast_to_python, "numexpr", None):
+            expected, _ = ASTToPython(self.df).eval(compile_dsl(dsl))
+        pd.testing.assert_series_equal(entry, expected)
+
+
+class TestCompiledSignal(unittest.TestCase):
+    def test_lookback_longer_than_frame(self):
+        df = pd.DataFrame({"volume": [1.0, 2.0, 3.0, 4.0]}, index=pd.date_range("2024-01-01", periods=4))
+        with mock.patch.object(ast_to_python, "numexpr", None):
+            entry, _ = ASTToPython(df).eval(compile_dsl("ENTRY: volume > volume_last_week"))
+        self.assertFalse(entry.any())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,58 @@
+import unittest
+
+from ast_nodes import ComparisonExpression, CrossExpression, LogicalExpression, Number
+from dsl_renderer import json_to_dsl
+from strategy_cache import compile_dsl
+
+
+class TestJsonToDsl(unittest.TestCase):
+    def test_cross_renders_in_prefix_form(self):
+        dsl = json_to_dsl({
+            "entry": [{"left": "sma(close,5)", "operator": "CROSS_ABOVE", "right": "sma(close,20)"}],
+            "exit": [{"left": "close", "operator": "CROSS_BELOW", "right": "sma(close,20)"}],
+        })
+        self.assertEqual(
+            dsl,
+            "ENTRY:\nCROSS_ABOVE(sma(close,5), sma(close,20))\nEXIT:\nCROSS_BELOW(close, sma(close,20))",
+        )
+        strategy = compile_dsl(dsl)
+        self.assertIsInstance(strategy.entry, CrossExpression)
+        self.assertEqual(strategy.exit.operator, "CROSS_BELOW")
+
+    def test_mixed_logic_joins_left_to_right(self):
+        dsl = json_to_dsl({"entry": [
+            {"left": "close", "operator": ">", "right": "sma(close,20)", "logic": "OR"},
+            {"left": "volume", "operator": ">", "right": "volume_last_week * 1.3", "logic": "AND"},
+            {"left": "rsi(close,14)", "operator": "<", "right": 30},
+        ]})
+        self.assertEqual(
+            dsl,
+            "ENTRY:\nclose > sma(close,20) OR volume > volume_last_week * 1.3 AND rsi(close,14) < 30",
+        )
+        entry = compile_dsl(dsl).entry
+        self.assertEqual(entry.operator, "AND")
+        self.assertEqual(entry.left.operator, "OR")
+
+    def test_missing_or_null_logic_defaults_to_and(self):
+        for rule in ({"left": "close", "operator": ">", "right": 100},
+                     {"left": "close", "operator": ">", "right": 100, "logic": None}):
+            with self.subTest(rule=rule):
+                dsl = json_to_dsl({"entry": [rule, {"left": "volume", "operator": ">", "right": 1000}]})
+                self.assertEqual(dsl, "ENTRY:\nclose > 100 AND volume > 1000")
+                self.assertIsInstance(compile_dsl(dsl).entry, LogicalExpression)
+
+    def test_extreme_numbers_parse_without_exponents(self):
+        for value, text in ((1e16, "10000000000000000"), (1e-07, "0.0000001")):
+            with self.subTest(value=value):
+                dsl = json_to_dsl({"exit": [{"left": "volume", "operator": ">", "right": value}]})
+                self.assertEqual(dsl, f"EXIT:\nvolume > {text}")
+                comparison = compile_dsl(dsl).exit
+                self.assertIsInstance(comparison, ComparisonExpression)
+                self.assertEqual(comparison.right, Number(value=value))
+
+    def test_empty_rules_render_nothing(self):
+        self.assertEqual(json_to_dsl({"entry": [], "exit": []}), "")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,53 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from indicators import rsi, sma
+
+
+def _series_with_gaps():
+    values = 100 + np.cumsum(np.random.default_rng(0).standard_normal(200))
+    values[[10, 11, 50]] = np.nan
+    values[[30, 90]] = np.inf
+    values[[31, 120]] = -np.inf
+    return pd.Series(values)
+
+
+class TestSMA(unittest.TestCase):
+    def test_matches_rolling_mean(self):
+        series = _series_with_gaps()
+        for window in (1, 2, 3, 14, 50):
+            with self.subTest(window=window):
+                np.testing.assert_allclose(
+                    sma(series, window), series.rolling(window).mean(), rtol=1e-12, equal_nan=True
+                )
+
+    def test_recovers_after_inf_leaves_window(self):
+        series = pd.Series([1.0, 2.0, np.inf] + [float(v) for v in range(3, 30)])
+        np.testing.assert_allclose(sma(series, 3), series.rolling(3).mean(), equal_nan=True)
+
+
+def _rolling_rsi(series, window):
+    delta = series.diff()
+    gain = delta.clip(lower=0).rolling(window).mean()
+    loss = -delta.clip(upper=0).rolling(window).mean()
+    return 100 - (100 / (1 + gain / loss))
+
+
+class TestRSI(unittest.TestCase):
+    def test_matches_rolling_rsi(self):
+        series = _series_with_gaps()
+        for window in (1, 2, 3, 14, 50):
+            with self.subTest(window=window):
+                np.testing.assert_allclose(
+                    rsi(series, window), _rolling_rsi(series, window), rtol=1e-9, equal_nan=True
+                )
+
+    def test_infinite_delta_is_missing(self):
+        series = pd.Series([1.0, np.inf, 1.0, 1.0, 1.0])
+        np.testing.assert_allclose(rsi(series, 2), _rolling_rsi(series, 2), equal_nan=True)
+
+
+if __name__ == "__main__":
+    unittest.main()